@@ -1,12 +1,60 @@
-from flask import Flask, jsonify, request
+import uuid
+
+from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
 from cinema_booking import BookingSystem
+from compression import JSON_MIMETYPE, ResponseCache, supported_encodings, supported_mimetypes
+from posters import MANIFEST, POSTER_DIR, apply_local_posters, poster_versions
+from pricing import normalize_booking_type
 
 app = Flask(__name__)
 CORS(app)
 
 system = BookingSystem()
 
+# Serve posters from backend/static/posters when the ingest pipeline has run
+apply_local_posters(system.movies)
+
+# HashMap → poster file path → content hash; only a matching ?v= is immutable
+POSTER_VERSIONS = poster_versions()
+
+# Serialised + compressed bodies, rebuilt only when the catalog changes
+response_cache = ResponseCache()
+
+# Per-process id in every ETag: version counters restart at zero on each
+# (re)start, so the same counters can describe different data after a reload
+BOOT_ID = uuid.uuid4().hex[:8]
+
+
+def send_cached(key, build):
+    """
+    Serve build() through the response cache.
+    - Format:   JSON, or MessagePack if the client asks for it
+    - Encoding: br / gzip per Accept-Encoding, compressed once per version
+    - ETag:     boot id + catalog version → If-None-Match gives a 304
+    """
+    version = system.catalog_version()
+    mimetype = request.accept_mimetypes.best_match(supported_mimetypes()) \
+        or supported_mimetypes()[0]
+    cached = response_cache.get(key, version, build, mimetype)
+    
+    encoding = request.accept_encodings.best_match(supported_encodings())
+    body, content_encoding = cached.encoded(encoding)
+    fmt = "json" if mimetype == JSON_MIMETYPE else "msgpack"
+    etag = f"{BOOT_ID}-{key}-{version[0]}-{version[1]}-{fmt}-{content_encoding or 'identity'}"
+    
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype=mimetype)
+        if content_encoding:
+            response.headers["Content-Encoding"] = content_encoding
+    
+    response.set_etag(etag)
+    response.vary.update(["Accept", "Accept-Encoding"])
+    response.cache_control.no_cache = True
+    return response
+
 # ============================================================================
 # GET MOVIES - Returns all movies with poster URLs, genre, and rating
 # ============================================================================
@@ -17,20 +65,29 @@ def get_movies():
     - id, name, genre, rating, poster_url
     - time_slots with available seats
     - tickets_sold count
+    
+    Body is cached per catalog version and compressed per Accept-Encoding.
     """
-    movies = []
-    for m in system.movies:
-        movie_data = {
-            "id": m.movie_id,
-            "name": m.name,
-            "genre": m.genre,
-            "rating": m.rating,
-            "poster_url": m.poster_url,
-            "slots": m.time_slots,
-            "tickets_sold": m.total_tickets_sold
-        }
-        movies.append(movie_data)
-    return jsonify(movies)
+    return send_cached("movies", lambda: [m.to_dict() for m in system.movies])
+
+
+# ============================================================================
+# GET AVAILABILITY - Compact seat availability for all movies
+# ============================================================================
+@app.route("/availability", methods=["GET"])
+def get_availability():
+    """
+    Sparse availability-only shape, for polling after /movies is loaded:
+    {
+        "1": [118, 120, 97],     # available seats, in /movies slot order
+        "2": [100, 0, 64]
+    }
+    Send "Accept: application/x-msgpack" for MessagePack (if installed).
+    """
+    return send_cached("availability", lambda: {
+        str(m.movie_id): [info["available"] for info in m.time_slots.values()]
+        for m in system.movies
+    })
 
 
 # ============================================================================
@@ -45,10 +102,15 @@ def book_ticket():
         "slot": "10:00 AM",
         "seats": 2,
         "name": "John Doe",
-        "type": "Normal" or "VIP"
+        "type": "Normal" or "VIP",
+        "waitlist": true            (optional, JSON boolean)
     }
     
-    Returns ticket_id on success
+    Returns ticket_id and the price charged on success.
+    If the show is full (or others are already waiting) and "waitlist" is
+    the JSON boolean true, the request is queued instead and a waitlist_id
+    is returned (202) to poll via /waitlist/<id>. Otherwise ("false", "0",
+    missing, ...) a queued show gives 409.
     """
     data = request.json
     
@@ -62,6 +124,12 @@ def book_ticket():
     except (ValueError, TypeError):
         return jsonify({"error": "Invalid movie_id or seats"}), 400
     
+    if seats <= 0:
+        return jsonify({"error": "Invalid movie_id or seats"}), 400
+    
+    if not normalize_booking_type(data["type"]):
+        return jsonify({"error": "Invalid booking type"}), 400
+    
     # Find movie
     movie = system._find_movie(movie_id)
     if not movie:
@@ -71,9 +139,32 @@ def book_ticket():
     if data["slot"] not in movie.time_slots:
         return jsonify({"error": "Invalid slot"}), 400
     
-    # Check available seats
-    if not movie.book_seats(data["slot"], seats):
-        available = movie.time_slots[data["slot"]]["available"]
+    # Each seat is priced at the occupancy it is sold at → O(tiers)
+    total_price = system.pricing.total_price(movie, data["slot"], data["type"], seats)
+    
+    # Check available seats; waiting customers come first, so a show with
+    # a queue counts as full even if a cancellation just freed seats
+    queued = system.waitlist.has_waiting(movie.movie_id, data["slot"])
+    if queued or not movie.book_seats(data["slot"], seats):
+        slot_info = movie.time_slots[data["slot"]]
+        if data.get("waitlist") is True and seats <= slot_info["total"]:
+            entry = system.waitlist.join(
+                data["name"], data["type"], movie.movie_id, data["slot"], seats
+            )
+            # Any seats still free go to the queue straight away
+            system.promote_waitlist(movie, data["slot"])
+            return jsonify({
+                "message": "Show is full. Added to waitlist",
+                "waitlist_id": entry.waitlist_id,
+                "status": entry.status,
+                "seats_promoted": entry.seats_promoted,
+                "ticket_ids": entry.ticket_ids
+            }), 202
+        if queued:
+            return jsonify({
+                "error": "Customers are waiting for this show. Join the waitlist"
+            }), 409
+        available = slot_info["available"]
         return jsonify({
             "error": f"Not enough seats. Available: {available}"
         }), 400
@@ -85,14 +176,16 @@ def book_ticket():
         data["type"],
         movie.name,
         data["slot"],
-        seats
+        seats,
+        total_price
     )
     
     system.tickets[ticket.ticket_id] = ticket
     
     return jsonify({
         "message": "Booked successfully",
-        "ticket_id": ticket.ticket_id
+        "ticket_id": ticket.ticket_id,
+        "total_price": ticket.total_price
     }), 201
 
 
@@ -110,6 +203,7 @@ def get_ticket(ticket_id):
         "movie_name": "Pathaan",
         "slot": "10:00 AM",
         "seats": 2,
+        "total_price": 1000,
         "booked_at": "2024-02-24 10:30"
     }
     """
@@ -124,6 +218,7 @@ def get_ticket(ticket_id):
         "movie_name": ticket.movie_name,
         "slot": ticket.slot,
         "seats": ticket.seats,
+        "total_price": ticket.total_price,
         "booked_at": ticket.booked_at
     }), 200
 
@@ -148,9 +243,56 @@ def cancel_ticket(ticket_id):
     # Delete ticket
     del system.tickets[ticket_id.upper()]
     
+    # Hand the freed seats to the waitlist (FIFO)
+    promoted = system.promote_waitlist(movie, ticket.slot) if movie else []
+    
     return jsonify({
         "message": "Ticket cancelled successfully",
-        "ticket_id": ticket_id.upper()
+        "ticket_id": ticket_id.upper(),
+        "waitlist_promoted": [entry.waitlist_id for entry, _ in promoted]
+    }), 200
+
+
+# ============================================================================
+# WAITLIST STATUS - Poll a waitlist request
+# ============================================================================
+@app.route("/waitlist/<waitlist_id>", methods=["GET"])
+def get_waitlist_status(waitlist_id):
+    """
+    Returns the waitlist entry. status is WAITING, PROMOTED or CANCELLED.
+    Seats are handed out as they free up: seats_promoted counts them and
+    ticket_ids lists one ticket per promotion. PROMOTED means the entry is
+    done and holds tickets: all seats were booked, or it left the waitlist
+    after a partial fill (seats_promoted < seats). CANCELLED holds none.
+    """
+    entry = system.waitlist.get(waitlist_id.upper())
+    if not entry:
+        return jsonify({"error": "Waitlist entry not found"}), 404
+    
+    return jsonify(entry.to_dict()), 200
+
+
+# ============================================================================
+# LEAVE WAITLIST - Withdraw a waiting request
+# ============================================================================
+@app.route("/waitlist/<waitlist_id>", methods=["DELETE"])
+def leave_waitlist(waitlist_id):
+    """
+    Withdraws a waiting request. A partly served entry keeps its tickets and
+    ends as PROMOTED; those seats must be cancelled via their ticket.
+    """
+    entry = system.waitlist.get(waitlist_id.upper())
+    if not entry:
+        return jsonify({"error": "Waitlist entry not found"}), 404
+    
+    if not system.waitlist.leave(entry.waitlist_id):
+        return jsonify({"error": f"Waitlist entry is already {entry.status}"}), 400
+    
+    return jsonify({
+        "message": "Left waitlist successfully",
+        "waitlist_id": entry.waitlist_id,
+        "status": entry.status,
+        "ticket_ids": entry.ticket_ids
     }), 200
 
 
@@ -235,6 +377,134 @@ def get_available_slots(movie_id):
     }), 200
 
 
+# ============================================================================
+# GET QUOTE - Current demand-based price for a booking
+# ============================================================================
+@app.route("/quote", methods=["GET"])
+def get_quote():
+    """
+    Query params: movie_id, slot, seats (default 1), type (Normal/VIP)
+    
+    Returns the live price for the booking, split by occupancy tier. The
+    response carries an ETag that only changes when the booking's seats move
+    across a tier boundary, so clients and proxies can revalidate cheaply
+    with If-None-Match (→ 304).
+    """
+    try:
+        movie_id = int(request.args.get("movie_id", ""))
+        seats = int(request.args.get("seats", 1))
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid movie_id or seats"}), 400
+    
+    if seats <= 0:
+        return jsonify({"error": "Invalid movie_id or seats"}), 400
+    
+    booking_type = normalize_booking_type(request.args.get("type", "Normal"))
+    if not booking_type:
+        return jsonify({"error": "Invalid booking type"}), 400
+    
+    movie = system._find_movie(movie_id)
+    if not movie:
+        return jsonify({"error": "Movie not found"}), 404
+    
+    slot = request.args.get("slot", "")
+    if slot not in movie.time_slots:
+        return jsonify({"error": "Invalid slot"}), 400
+    
+    if seats > movie.time_slots[slot]["total"]:
+        return jsonify({"error": "Seats exceed slot capacity"}), 400
+    
+    etag = f"{BOOT_ID}-{system.pricing.etag(movie, slot, booking_type, seats)}"
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(system.pricing.quote(movie, slot, booking_type, seats))
+    
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response
+
+
+# ============================================================================
+# SEARCH MOVIES - Full-text + faceted search over name and genre
+# ============================================================================
+@app.route("/search", methods=["GET"])
+def search_movies():
+    """
+    Query params (all optional):
+    - q          : text; 1-2 letter words match word prefixes (typeahead),
+                   longer words match any substring (prefixes included)
+    - genre      : exact genre, case-insensitive
+    - min_rating : lower rating bound (inclusive)
+    - max_rating : upper rating bound (inclusive)
+    - available  : "true" / "false" → has seats in any slot
+    - limit      : max results (default 20, max 100)
+    
+    Returns matches ordered by rating, total match count and genre facet counts.
+    On very broad text queries total/facets are estimated (total_exact: false)
+    """
+    args = request.args
+    try:
+        min_rating = float(args["min_rating"]) if "min_rating" in args else None
+        max_rating = float(args["max_rating"]) if "max_rating" in args else None
+        limit = min(max(int(args.get("limit", 20)), 0), 100)
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid rating or limit"}), 400
+    
+    available = None
+    if "available" in args:
+        flag = args["available"].strip().lower()
+        if flag not in ("true", "false", "1", "0"):
+            return jsonify({"error": "Invalid available flag"}), 400
+        available = flag in ("true", "1")
+    
+    result = system.search_index.search(
+        args.get("q", ""),
+        genre=args.get("genre") or None,
+        min_rating=min_rating,
+        max_rating=max_rating,
+        available=available,
+        limit=limit
+    )
+    
+    return jsonify({
+        "query": args.get("q", ""),
+        "total": result["total"],
+        "total_exact": result["total_exact"],
+        "results": [m.to_dict() for m in result["results"]],
+        "facets": result["facets"]
+    }), 200
+
+
+# ============================================================================
+# POSTERS - Locally cached poster images
+# ============================================================================
+@app.route("/posters/<path:filename>", methods=["GET"])
+def get_poster(filename):
+    """
+    Serves images built by posters.py.
+    - With the file's current ?v=<content hash> (as in /movies): cached
+      for a year, immutable
+    - Without it, or with any other v: revalidated on every use via the ETag
+    The pipeline's manifest is internal and never served.
+    """
+    if filename == MANIFEST:
+        return jsonify({"error": "Endpoint not found"}), 404
+    
+    version = POSTER_VERSIONS.get(filename)
+    versioned = version is not None and request.args.get("v") == version
+    response = send_from_directory(POSTER_DIR, filename,
+                                   max_age=31536000 if versioned else 0,
+                                   etag=True, conditional=True)
+    response.cache_control.public = True
+    if versioned:
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+
 # ============================================================================
 # ERROR HANDLERS
 # ============================================================================
@@ -276,12 +546,18 @@ def api_docs():
         "version": "2.0",
         "endpoints": {
             "GET /movies": "Get all movies with posters and ratings",
+            "GET /availability": "Compact seat availability (JSON or MessagePack)",
             "GET /movie/<id>": "Get specific movie details",
             "GET /popular": "Get movies sorted by popularity",
             "GET /slots/<id>": "Get available slots for a movie",
+            "GET /search": "Search movies by name/genre with facets",
+            "GET /quote": "Get current price for movie_id, slot, seats, type",
             "POST /book": "Book a ticket",
             "GET /ticket/<id>": "Get ticket details",
             "DELETE /cancel/<id>": "Cancel a ticket",
+            "GET /waitlist/<id>": "Poll a waitlist request",
+            "DELETE /waitlist/<id>": "Leave the waitlist",
+            "GET /posters/<file>": "Locally cached poster image",
             "GET /health": "Health check"
         },
         "movies": {
@@ -1,6 +1,10 @@
 import uuid
 from datetime import datetime
 
+from pricing import PricingEngine
+from search import MovieSearchIndex
+from waitlist import Waitlist
+
 
 # ─────────────────────────────────────────
 # CLASS 1: Movie
@@ -20,6 +24,12 @@ class Movie:
         self.poster_url = poster_url
         self.total_tickets_sold = 0
 
+        # Bumped on every seat change → lets cached responses detect staleness
+        self.version = 0
+
+        # Optional callback(movie) after every seat change (e.g. search index)
+        self.on_seats_changed = None
+
         # Dictionary: { "10:00 AM": {"total": 100, "available": 100} }
         self.time_slots: dict[str, dict] = {}
         for slot in slots:
@@ -43,6 +53,9 @@ class Movie:
             return False
         self.time_slots[slot]["available"] -= count
         self.total_tickets_sold += count
+        self.version += 1
+        if self.on_seats_changed:
+            self.on_seats_changed(self)
         return True
 
     def restore_seats(self, slot: str, count: int):
@@ -50,6 +63,9 @@ class Movie:
         if slot in self.time_slots:
             self.time_slots[slot]["available"] += count
             self.total_tickets_sold -= count
+            self.version += 1
+            if self.on_seats_changed:
+                self.on_seats_changed(self)
 
     def to_dict(self):
         """Convert movie to dictionary for JSON serialization."""
@@ -77,7 +93,8 @@ class Ticket:
     VIP    = "VIP Member"
 
     def __init__(self, customer_name: str, booking_type: str,
-                 movie_name: str, slot: str, seats: int):
+                 movie_name: str, slot: str, seats: int,
+                 total_price: int = 0):
         # UUID ensures uniqueness → O(1) amortized generation
         self.ticket_id    = str(uuid.uuid4())[:8].upper()
         self.customer_name = customer_name
@@ -85,6 +102,7 @@ class Ticket:
         self.movie_name    = movie_name
         self.slot          = slot
         self.seats         = seats
+        self.total_price   = total_price
         self.booked_at     = datetime.now().strftime("%Y-%m-%d %H:%M")
 
     def display(self):
@@ -98,6 +116,7 @@ class Ticket:
       Movie       : {self.movie_name:<18} 
       Slot        : {self.slot:<18}
       Seats       : {str(self.seats):<18}
+      Total Price : ₹{self.total_price:<17}
       Booked At   : {self.booked_at:<18} 
                   Enjoy the show! 🎬
         """)
@@ -111,6 +130,7 @@ class Ticket:
             "movie_name": self.movie_name,
             "slot": self.slot,
             "seats": self.seats,
+            "total_price": self.total_price,
             "booked_at": self.booked_at
         }
 
@@ -124,6 +144,9 @@ class BookingSystem:
     DSA Used:
       - List (Array)   → store movies
       - Dictionary     → store tickets (HashMap, ticket_id → Ticket)
+      - PricingEngine  → demand-based price from precomputed tier tables
+      - Inverted index → name/genre search (MovieSearchIndex)
+      - Queue (deque)  → FIFO waitlist per (movie, slot)
     """
 
     def __init__(self):
@@ -133,6 +156,15 @@ class BookingSystem:
         # HashMap → O(1) search, insert, delete by ticket_id
         self.tickets: dict[str, Ticket] = {}
 
+        # Precomputed tier tables → O(tiers) price per booking
+        self.pricing = PricingEngine()
+
+        # Inverted index → search by name/genre without scanning the list
+        self.search_index = MovieSearchIndex()
+
+        # HashMap of Queues → sold-out shows, promoted on cancellation
+        self.waitlist = Waitlist()
+
         self._preload_movies()
 
     # ── 1. PRELOAD MOVIES ──────────────────
@@ -232,9 +264,23 @@ class BookingSystem:
                 120
             ),
         ]
-        self.movies.extend(preloaded)
+        for movie in preloaded:
+            self.add_movie(movie)
         print(f"✅ {len(self.movies)} movies preloaded into system (5 Hollywood + 5 Bollywood).")
 
+    def add_movie(self, movie: Movie):
+        """Append to the list and index for search. O(1) + index update."""
+        self.movies.append(movie)
+        self.search_index.add(movie)
+        movie.on_seats_changed = self.search_index.update_availability
+
+    def catalog_version(self) -> tuple[int, int]:
+        """
+        (movie count, sum of movie versions). Changes whenever a movie is
+        added or any seat count changes, since versions only increase. O(n).
+        """
+        return len(self.movies), sum(m.version for m in self.movies)
+
     # ── 2. DISPLAY ALL MOVIES ──────────────
     def display_movies(self):
         """
@@ -318,11 +364,25 @@ class BookingSystem:
             print("❌ Name cannot be empty.")
             return
 
-        if not movie.book_seats(slot, seats):
-            print(f"❌ Not enough seats. Available: {movie.time_slots[slot]['available']}")
+        # Each seat is priced at the occupancy it is sold at
+        price = self.pricing.total_price(movie, slot, booking_type, seats)
+
+        # Waiting customers come first, so a queued show counts as full
+        queued = self.waitlist.has_waiting(movie.movie_id, slot)
+        if queued or not movie.book_seats(slot, seats):
+            if queued:
+                print("❌ Customers are already waiting for this show.")
+            else:
+                print(f"❌ Not enough seats. Available: {movie.time_slots[slot]['available']}")
+            if seats <= movie.time_slots[slot]["total"] and \
+                    input("Join the waitlist? (y/n): ").strip().lower() == "y":
+                entry = self.waitlist.join(name, booking_type, movie.movie_id, slot, seats)
+                self.promote_waitlist(movie, slot)   # takes any seats still free
+                print(f"⏳ Added to waitlist. Waitlist ID: {entry.waitlist_id} "
+                      f"({entry.seats_promoted}/{entry.seats} seats booked so far)")
             return
 
-        ticket = Ticket(name, booking_type, movie.name, slot, seats)
+        ticket = Ticket(name, booking_type, movie.name, slot, seats, price)
         self.tickets[ticket.ticket_id] = ticket   # O(1) HashMap insert
         ticket.display()
 
@@ -346,6 +406,32 @@ class BookingSystem:
         del self.tickets[tid]               # O(1) hash delete
         print(f"✅ Ticket {tid} cancelled. Seats restored for '{ticket.movie_name}' @ {ticket.slot}.")
 
+        if movie:
+            for entry, ticket in self.promote_waitlist(movie, ticket.slot):
+                print(f"🎟️  Waitlist {entry.waitlist_id} ({entry.customer_name}) "
+                      f"got {ticket.seats} seat(s) → Ticket {ticket.ticket_id}")
+
+    def promote_waitlist(self, movie: Movie, slot: str) -> list:
+        """
+        Turn free seats into tickets for waiting requests.
+        FIFO order, O(k) in the number of entries served. The head entry
+        may get only part of its seats; it keeps its place for the rest.
+        Returns [(WaitlistEntry, Ticket), ...].
+        """
+        promoted = []
+        granted = self.waitlist.allocate(
+            movie.movie_id, slot, movie.time_slots[slot]["available"])
+        for entry, seats in granted:
+            price = self.pricing.total_price(movie, slot, entry.booking_type, seats)
+            movie.book_seats(slot, seats)
+
+            ticket = Ticket(entry.customer_name, entry.booking_type,
+                            movie.name, slot, seats, price)
+            self.tickets[ticket.ticket_id] = ticket
+            entry.ticket_ids.append(ticket.ticket_id)
+            promoted.append((entry, ticket))
+        return promoted
+
     def _find_movie_by_name(self, name: str) -> Movie | None:
         """O(n) linear search by name."""
         for movie in self.movies:
@@ -374,6 +460,7 @@ class BookingSystem:
   Movie        : {ticket.movie_name}
   Time Slot    : {ticket.slot}
   Seats Booked : {ticket.seats}
+  Total Price  : ₹{ticket.total_price}
   Booked At    : {ticket.booked_at}""")
 
     # ── 6. POPULAR MOVIES ─────────────────
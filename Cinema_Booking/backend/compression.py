@@ -0,0 +1,109 @@
+"""
+Response encoding helpers.
+
+- Bodies are serialised once per catalog version and cached.
+- Each cached body is compressed at most once per Content-Encoding
+  (gzip always, brotli when the `brotli` package is installed).
+- MessagePack is offered as a compact format when `msgpack` is installed.
+
+DSA: HashMap → cache key → CachedBody, and inside it
+     HashMap → encoding → compressed bytes, so a warm request is
+     two O(1) lookups with no JSON encoding or compression work.
+"""
+import gzip
+import json
+
+try:
+    import brotli
+except ImportError:          # optional: pip install brotli
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:          # optional: pip install msgpack
+    msgpack = None
+
+
+JSON_MIMETYPE    = "application/json"
+MSGPACK_MIMETYPE = "application/x-msgpack"
+
+# Bodies smaller than this are sent as-is; headers would outweigh the saving
+MIN_COMPRESS_SIZE = 512
+
+GZIP_LEVEL   = 6
+BROTLI_LEVEL = 5
+
+
+def supported_encodings() -> list[str]:
+    """Content-Encodings this server can produce, in preference order."""
+    return ["br", "gzip"] if brotli else ["gzip"]
+
+
+def supported_mimetypes() -> list[str]:
+    """Body formats this server can produce, JSON first (the default)."""
+    return [JSON_MIMETYPE, MSGPACK_MIMETYPE] if msgpack else [JSON_MIMETYPE]
+
+
+def serialize(data, mimetype: str = JSON_MIMETYPE) -> bytes:
+    """Encode data as compact JSON or MessagePack."""
+    if mimetype == MSGPACK_MIMETYPE:
+        return msgpack.packb(data, use_bin_type=True)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a body for the given Content-Encoding."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_LEVEL)
+    if encoding == "gzip":
+        # mtime=0 → identical input gives identical bytes (stable ETags)
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    return body
+
+
+# ─────────────────────────────────────────
+# CLASS: CachedBody
+# ─────────────────────────────────────────
+class CachedBody:
+    """One serialised response plus its compressed variants."""
+
+    def __init__(self, version, body: bytes, mimetype: str):
+        self.version  = version
+        self.body     = body
+        self.mimetype = mimetype
+        self._encoded: dict[str, bytes] = {}
+
+    def encoded(self, encoding: str | None) -> tuple[bytes, str | None]:
+        """
+        Body for the negotiated encoding → (bytes, Content-Encoding or None).
+        Compression runs on first use only.
+        """
+        if not encoding or len(self.body) < MIN_COMPRESS_SIZE:
+            return self.body, None
+        data = self._encoded.get(encoding)
+        if data is None:
+            data = compress(self.body, encoding)
+            self._encoded[encoding] = data
+        return data, encoding
+
+
+# ─────────────────────────────────────────
+# CLASS: ResponseCache
+# ─────────────────────────────────────────
+class ResponseCache:
+    """
+    Keeps the latest CachedBody per key. A body is rebuilt only when the
+    caller's version changes (e.g. after a booking or cancellation).
+    """
+
+    def __init__(self):
+        self._bodies: dict[tuple, CachedBody] = {}
+
+    def get(self, key, version, build, mimetype: str = JSON_MIMETYPE) -> CachedBody:
+        """Return the cached body for key, calling build() if it is stale."""
+        cache_key = (key, mimetype)
+        cached = self._bodies.get(cache_key)
+        if cached is None or cached.version != version:
+            cached = CachedBody(version, serialize(build(), mimetype), mimetype)
+            self._bodies[cache_key] = cached
+        return cached
@@ -0,0 +1,263 @@
+"""
+Local poster cache.
+
+Offline pipeline that imports (or downloads once) movie posters into
+backend/static/posters/ and renders resized WebP variants, so the
+frontend no longer loads posters from the TMDB CDN.
+
+Usage:
+    python posters.py                    # use images already in static/posters
+    python posters.py --source ~/imgs    # import local files first
+    python posters.py --fetch            # download missing posters from poster_url
+
+Originals are named after the movie: "Phir Hera Pheri" → phir_hera_pheri.jpg
+(a source file may also be named by movie id, e.g. 9.jpg).
+Variants go to static/posters/variants/<slug>-<width>.webp and are listed
+in static/posters/manifest.json, which the backend reads at start-up.
+Each file's content hash is its URL version (?v=), so re-rendering with
+new settings also changes the URL.
+
+Requires Pillow (pip install Pillow) for rendering; the backend itself
+only reads the manifest and works without it.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:          # optional: only needed to render variants
+    Image = None
+
+
+POSTER_DIR   = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "posters")
+VARIANT_DIR  = "variants"
+MANIFEST     = "manifest.json"
+
+# TMDB-like widths; DEFAULT_WIDTH is what /movies points at (cards are ~190px wide)
+WIDTHS        = (185, 342, 500)
+DEFAULT_WIDTH = 342
+WEBP_QUALITY  = 80
+
+# Anything that changes rendered bytes; a change re-renders every variant
+RENDER_SETTINGS = f"webp q{WEBP_QUALITY} m6 lanczos widths={','.join(map(str, WIDTHS))}"
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+def slugify(name: str) -> str:
+    """Filename stem for a movie: Dune Part Two → dune_part_two."""
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def _find_image(directory: str, stems: list[str]) -> str | None:
+    """First file in directory named <stem><ext> for any stem/extension."""
+    for stem in stems:
+        for ext in IMAGE_EXTENSIONS:
+            path = os.path.join(directory, stem + ext)
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def _file_hash(path: str) -> str:
+    """Short content hash, used as a cache-busting version in URLs."""
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:10]
+
+
+# ─────────────────────────────────────────
+# STEP 1: COLLECT ORIGINALS
+# ─────────────────────────────────────────
+def collect_originals(movies, poster_dir: str = POSTER_DIR,
+                      source_dir: str | None = None, fetch: bool = False) -> dict[str, str]:
+    """
+    Make sure each movie has an original in poster_dir.
+    Returns { slug: path to original } for every movie that has one.
+    Existing originals are never re-imported or re-downloaded.
+    """
+    os.makedirs(poster_dir, exist_ok=True)
+    originals = {}
+
+    for movie in movies:
+        slug = slugify(movie.name)
+        path = _find_image(poster_dir, [slug])
+
+        if path is None and source_dir:
+            src = _find_image(source_dir, [slug, str(movie.movie_id)])
+            if src:
+                path = os.path.join(poster_dir, slug + os.path.splitext(src)[1].lower())
+                shutil.copyfile(src, path)
+
+        if path is None and fetch and movie.poster_url.startswith("http"):
+            path = os.path.join(poster_dir, slug + ".jpg")
+            try:
+                with urllib.request.urlopen(movie.poster_url, timeout=10) as resp, \
+                        open(path, "wb") as out:
+                    shutil.copyfileobj(resp, out)
+            except OSError as e:
+                print(f"❌ {movie.name}: download failed ({e})")
+                if os.path.exists(path):
+                    os.remove(path)
+                path = None
+
+        if path:
+            originals[slug] = path
+    return originals
+
+
+# ─────────────────────────────────────────
+# STEP 2: RENDER VARIANTS (process pool)
+# ─────────────────────────────────────────
+def render_variants(src: str, out_dir: str, slug: str,
+                    widths: tuple[int, ...] = WIDTHS, force: bool = False) -> dict[str, str]:
+    """
+    Write <slug>-<width>.webp for each width. Runs in a worker process.
+    Unless forced, skips variants that are newer than the original.
+    Returns { width: filename }.
+    """
+    src_mtime = os.path.getmtime(src)
+    variants = {}
+    image = None
+
+    for width in widths:
+        filename = f"{slug}-{width}.webp"
+        path = os.path.join(out_dir, filename)
+        variants[str(width)] = filename
+        if not force and os.path.exists(path) and os.path.getmtime(path) >= src_mtime:
+            continue
+
+        if image is None:
+            image = Image.open(src)
+            image.load()
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGB")
+
+        # Never upscale; keep the aspect ratio
+        w = min(width, image.width)
+        h = round(image.height * w / image.width)
+        image.resize((w, h), Image.LANCZOS).save(path, "WEBP", quality=WEBP_QUALITY, method=6)
+
+    return variants
+
+
+def build_posters(movies, poster_dir: str = POSTER_DIR, source_dir: str | None = None,
+                  fetch: bool = False, workers: int | None = None) -> dict:
+    """
+    Run the full pipeline and write the manifest:
+    { "_settings": RENDER_SETTINGS,
+      slug: { "original": {"path": "badla.jpg", "version": <hash>},
+              "variants": { "185": {"path": "variants/badla-185.webp",
+                                    "version": <hash>}, ... } } }
+    Versions hash the file itself, so any change to the image or to the
+    render settings (WIDTHS, WEBP_QUALITY, ...) gives a new URL.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is required to render posters: pip install Pillow")
+
+    originals = collect_originals(movies, poster_dir, source_dir, fetch)
+    out_dir = os.path.join(poster_dir, VARIANT_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Settings changed since the last run → re-render everything
+    manifest_path = os.path.join(poster_dir, MANIFEST)
+    try:
+        with open(manifest_path) as f:
+            force = json.load(f).get("_settings") != RENDER_SETTINGS
+    except (OSError, ValueError):
+        force = True
+
+    manifest = {"_settings": RENDER_SETTINGS}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = {slug: pool.submit(render_variants, path, out_dir, slug, WIDTHS, force)
+                for slug, path in originals.items()}
+        for slug, job in jobs.items():
+            variants = job.result()
+            manifest[slug] = {
+                "original": {
+                    "path": os.path.basename(originals[slug]),
+                    "version": _file_hash(originals[slug])
+                },
+                "variants": {
+                    w: {"path": f"{VARIANT_DIR}/{name}",
+                        "version": _file_hash(os.path.join(out_dir, name))}
+                    for w, name in variants.items()
+                }
+            }
+
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+# ─────────────────────────────────────────
+# BACKEND: USE LOCAL POSTERS
+# ─────────────────────────────────────────
+def load_manifest(poster_dir: str = POSTER_DIR) -> dict:
+    """The pipeline's manifest, or {} if it has not been built yet."""
+    try:
+        with open(os.path.join(poster_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def poster_versions(poster_dir: str = POSTER_DIR) -> dict[str, str]:
+    """
+    { file path: content hash } for every original and variant in the
+    manifest, so the server can tell a current ?v= from a stale or made-up one.
+    """
+    versions = {}
+    for entry in load_manifest(poster_dir).values():
+        if not isinstance(entry, dict):          # "_settings"
+            continue
+        for image in [entry["original"], *entry["variants"].values()]:
+            versions[image["path"]] = image["version"]
+    return versions
+
+
+def apply_local_posters(movies, poster_dir: str = POSTER_DIR,
+                        url_prefix: str = "/posters") -> int:
+    """
+    Point poster_url at the local variant for every movie in the manifest.
+    The file's content hash is added as ?v= so URLs can be cached forever.
+    Returns the number of movies switched to local posters.
+    """
+    manifest = load_manifest(poster_dir)
+    count = 0
+    for movie in movies:
+        entry = manifest.get(slugify(movie.name))
+        if not entry:
+            continue
+        image = entry["variants"].get(str(DEFAULT_WIDTH)) or entry["original"]
+        if not os.path.isfile(os.path.join(poster_dir, image["path"])):
+            continue
+        movie.poster_url = f"{url_prefix}/{image['path']}?v={image['version']}"
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the local poster cache.")
+    parser.add_argument("--source", help="directory of poster images to import")
+    parser.add_argument("--fetch", action="store_true",
+                        help="download missing posters from poster_url")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes used to render variants")
+    args = parser.parse_args()
+
+    from cinema_booking import BookingSystem
+    system = BookingSystem()
+
+    manifest = build_posters(system.movies, source_dir=args.source,
+                             fetch=args.fetch, workers=args.workers)
+    print(f"✅ {len(manifest) - 1}/{len(system.movies)} posters cached in {POSTER_DIR}")
+
+
+if __name__ == "__main__":
+    main()
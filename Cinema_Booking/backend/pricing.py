@@ -0,0 +1,177 @@
+"""
+Demand-based ticket pricing.
+
+Prices are derived from three inputs:
+  - the base price of a seat (₹500 by default)
+  - the booking type (Normal / VIP)
+  - the live occupancy of the slot (booked / total)
+
+DSA: Prices per (type, tier) are precomputed at start-up, so pricing a
+booking is a few list/dict lookups per tier → O(tiers), no float maths on /book.
+"""
+import zlib
+
+
+# ─────────────────────────────────────────
+# TIER TABLES (precomputed once)
+# ─────────────────────────────────────────
+BASE_PRICE = 500
+
+# (minimum occupancy %, multiplier) — sorted by occupancy, first tier starts at 0
+OCCUPANCY_TIERS: list[tuple[int, float]] = [
+    (0,  1.00),   # Plenty of seats
+    (50, 1.10),   # Filling up
+    (75, 1.25),   # High demand
+    (90, 1.50),   # Almost sold out
+]
+
+TYPE_MULTIPLIERS: dict[str, float] = {
+    "Normal": 1.0,
+    "VIP":    1.5,
+}
+
+# Accept both the API labels ("Normal"/"VIP") and Ticket labels
+# ("Normal Customer"/"VIP Member") → O(1) normalisation
+_TYPE_ALIASES: dict[str, str] = {
+    "normal": "Normal",
+    "normal customer": "Normal",
+    "vip": "VIP",
+    "vip member": "VIP",
+}
+
+
+def _build_tier_lookup() -> list[int]:
+    """Array indexed by occupancy % (0-100) → tier index. O(101) once."""
+    lookup = []
+    tier = 0
+    for pct in range(101):
+        while tier + 1 < len(OCCUPANCY_TIERS) and pct >= OCCUPANCY_TIERS[tier + 1][0]:
+            tier += 1
+        lookup.append(tier)
+    return lookup
+
+
+def _build_price_table(base_price: int) -> dict[str, list[int]]:
+    """{ booking_type: [price for tier 0, tier 1, ...] } in whole rupees."""
+    return {
+        btype: [round(base_price * type_mult * tier_mult)
+                for _, tier_mult in OCCUPANCY_TIERS]
+        for btype, type_mult in TYPE_MULTIPLIERS.items()
+    }
+
+
+TIER_LOOKUP = _build_tier_lookup()
+
+
+def normalize_booking_type(booking_type: str) -> str | None:
+    """Map any accepted label to "Normal"/"VIP". Returns None if unknown."""
+    return _TYPE_ALIASES.get(str(booking_type).strip().lower())
+
+
+def occupancy_tier(total: int, available: int) -> int:
+    """Tier index for a slot. Integer maths + array lookup → O(1)."""
+    if total <= 0:
+        return len(OCCUPANCY_TIERS) - 1
+    booked = total - available
+    return TIER_LOOKUP[booked * 100 // total]
+
+
+# ─────────────────────────────────────────
+# CLASS: PricingEngine
+# ─────────────────────────────────────────
+class PricingEngine:
+    """
+    Computes demand-based ticket prices.
+    DSA Used:
+      - Array          → occupancy % → tier (TIER_LOOKUP)
+      - Dictionary     → booking type → price per tier (the only price cache)
+      - Dictionary     → slot size → booked-seat count where each tier starts
+    Every seat of a booking is priced at the occupancy it is sold at, so a
+    large booking that crosses tier boundaries pays each tier's price for the
+    seats inside it. A quote is O(tiers) and nothing grows per request.
+    """
+
+    def __init__(self, base_price: int = BASE_PRICE):
+        self.base_price = base_price
+        self.price_table = _build_price_table(base_price)
+
+        # HashMap → total seats → [first booked count of tier 0, tier 1, ...]
+        self._tier_bounds: dict[int, list[int]] = {}
+
+    def _bounds(self, total: int) -> list[int]:
+        """
+        Booked-seat count at which each tier starts for a slot of this size.
+        booked * 100 // total >= pct  ⇔  booked >= ceil(pct * total / 100)
+        """
+        bounds = self._tier_bounds.get(total)
+        if bounds is None:
+            bounds = [-(-pct * total // 100) for pct, _ in OCCUPANCY_TIERS]
+            self._tier_bounds[total] = bounds
+        return bounds
+
+    def _prices(self, booking_type: str) -> tuple[str, list[int]]:
+        """Normalised type and its price per tier. Unknown types are an error."""
+        btype = normalize_booking_type(booking_type)
+        if btype is None:
+            raise ValueError(f"Unknown booking type: {booking_type!r}")
+        return btype, self.price_table[btype]
+
+    def current_tier(self, movie, slot: str) -> int:
+        """Tier the next seat of a slot is sold at. O(1)."""
+        info = movie.time_slots[slot]
+        return occupancy_tier(info["total"], info["available"])
+
+    def breakdown(self, movie, slot: str, seats: int) -> list[tuple[int, int]]:
+        """
+        Split a booking into [(tier, seat count), ...]. O(tiers).
+        Seat k of the booking is priced at the occupancy before it is sold.
+        """
+        info = movie.time_slots[slot]
+        total = info["total"]
+        if total <= 0:
+            return [(len(OCCUPANCY_TIERS) - 1, seats)]
+
+        start = total - info["available"]     # seats already booked
+        end = start + seats
+        bounds = self._bounds(total)
+        parts = []
+        for tier, lo in enumerate(bounds):
+            hi = bounds[tier + 1] if tier + 1 < len(bounds) else end
+            count = min(end, hi) - max(start, lo)
+            if count > 0:
+                parts.append((tier, count))
+        return parts
+
+    def total_price(self, movie, slot: str, booking_type: str, seats: int) -> int:
+        """Price of a whole booking made now. O(tiers)."""
+        _, prices = self._prices(booking_type)
+        return sum(prices[tier] * count for tier, count in self.breakdown(movie, slot, seats))
+
+    def quote(self, movie, slot: str, booking_type: str, seats: int) -> dict:
+        """Full price quote for a booking, with the per-tier breakdown."""
+        btype, prices = self._prices(booking_type)
+        parts = self.breakdown(movie, slot, seats)
+        tier = self.current_tier(movie, slot)
+        return {
+            "movie_id": movie.movie_id,
+            "slot": slot,
+            "type": btype,
+            "seats": seats,
+            "tier": tier,
+            "multiplier": OCCUPANCY_TIERS[tier][1],
+            "base_price": self.base_price,
+            "price_per_seat": prices[tier],
+            "total_price": sum(prices[t] * count for t, count in parts),
+            "breakdown": [{"tier": t, "seats": count, "price_per_seat": prices[t]}
+                          for t, count in parts],
+            "currency": "INR",
+        }
+
+    def etag(self, movie, slot: str, booking_type: str, seats: int) -> str:
+        """
+        Validator for a quote. Built from the tier breakdown, so it only
+        changes when the seats of this booking move across a tier boundary.
+        """
+        btype, _ = self._prices(booking_type)
+        parts = "-".join(f"t{t}x{count}" for t, count in self.breakdown(movie, slot, seats))
+        return f"{movie.movie_id}-{zlib.crc32(slot.encode()):08x}-{btype}-{parts}"
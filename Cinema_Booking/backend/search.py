@@ -0,0 +1,361 @@
+"""
+In-memory movie search.
+
+Full-text search over Movie.name and genre with typeahead support,
+plus facets for genre, rating range and seat availability.
+
+DSA Used:
+  - Inverted index (HashMap)  → 1-2 char prefix → set of movie ids (typeahead)
+  - Inverted index (HashMap)  → trigram → set of movie ids (substring match,
+                                 which includes longer prefixes)
+  - HashMap                   → genre → set of movie ids (facet)
+  - Sorted lists + bisect     → rating order, globally and per genre
+  - Set                       → sold-out movie ids (availability facet)
+Every structure is updated incrementally when a movie is added or its
+seats change.
+
+Work per query is capped. A query either filters a small candidate set
+(≤ SCAN_LIMIT ids) exactly, or walks the rating order from the top until
+it has a page of results, in which case total and facet counts are
+estimates ("total_exact": False). When a sample predicts that walk to be
+longer than an exact pass, the posting sets are intersected in C instead.
+"""
+import heapq
+import re
+from itertools import islice
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+
+
+# Query words up to this length match word prefixes directly; longer
+# words match any substring through trigrams (too short for trigrams)
+MAX_PREFIX_LEN = 2
+
+# Max ids examined per query; bounds latency on large catalogs
+SCAN_LIMIT = 1000
+
+# Cost of an exact pass, in units of one step of the rating walk (measured
+# with CPython): per driver id per other set intersected in C, and per match
+# ranked and counted. SAMPLE_SIZE driver ids predict both sides.
+INTERSECT_COST = 0.2
+RESULT_COST    = 2
+SAMPLE_SIZE    = 64
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric words. O(len(text))."""
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def trigrams(token: str) -> set[str]:
+    """All 3-character substrings of a token."""
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def has_available_seats(movie) -> bool:
+    """True if any slot of the movie still has seats. O(s)."""
+    return any(info["available"] > 0 for info in movie.time_slots.values())
+
+
+# ─────────────────────────────────────────
+# CLASS: MovieSearchIndex
+# ─────────────────────────────────────────
+class MovieSearchIndex:
+    """
+    Incrementally maintained search index over a movie catalog.
+    Movies are referenced by movie_id; the index keeps its own
+    id → Movie map so results never need a linear scan.
+    """
+
+    def __init__(self):
+        # HashMap → movie_id → Movie, O(1) lookup
+        self._movies: dict[int, object] = {}
+
+        # Inverted indexes → token prefix / trigram → { movie_id }
+        self._prefixes: dict[str, set[int]] = {}
+        self._trigrams: dict[str, set[int]] = {}
+
+        # Facet indexes
+        self._genres: dict[str, set[int]] = {}
+        self._genre_labels: dict[str, str] = {}              # "action" → "Action"
+        self._ratings: list[tuple[float, int]] = []          # sorted (rating, id)
+        self._genre_ratings: dict[str, list[tuple[float, int]]] = {}
+        self._sold_out: set[int] = set()
+        self._sold_out_ratings: dict[str, list[tuple[float, int]]] = {}
+
+        # Lowercased "name genre" per movie, used to verify trigram hits
+        self._text: dict[int, str] = {}
+
+        # (rating, genre key) each movie was indexed under; the Movie may be
+        # edited before it is re-indexed, so removal never trusts its fields
+        self._indexed: dict[int, tuple[float, str]] = {}
+
+    def __len__(self):
+        return len(self._movies)
+
+    # ── INDEXING ──────────────────────────
+    def add(self, movie):
+        """
+        Index one movie. O(t * L) for t tokens of length L,
+        plus O(n) worst case for the sorted rating inserts.
+        """
+        mid = movie.movie_id
+        if mid in self._movies:
+            self.remove(mid)
+
+        self._movies[mid] = movie
+        text = f"{movie.name} {movie.genre}".lower()
+        self._text[mid] = text
+
+        for token in tokenize(text):
+            for end in range(1, min(len(token), MAX_PREFIX_LEN) + 1):
+                self._prefixes.setdefault(token[:end], set()).add(mid)
+            for gram in trigrams(token):
+                self._trigrams.setdefault(gram, set()).add(mid)
+
+        rating, genre = movie.rating, movie.genre.lower()
+        self._indexed[mid] = (rating, genre)
+        self._genres.setdefault(genre, set()).add(mid)
+        self._genre_labels.setdefault(genre, movie.genre)
+        insort(self._ratings, (rating, mid))
+        insort(self._genre_ratings.setdefault(genre, []), (rating, mid))
+        self.update_availability(movie)
+
+    def remove(self, movie_id: int):
+        """Drop a movie from every index. O(t * L + n)."""
+        if movie_id not in self._movies:
+            return
+        self._set_sold_out(movie_id, False)
+        del self._movies[movie_id]
+        text = self._text.pop(movie_id)
+        rating, genre = self._indexed.pop(movie_id)
+
+        for token in tokenize(text):
+            for end in range(1, min(len(token), MAX_PREFIX_LEN) + 1):
+                self._discard(self._prefixes, token[:end], movie_id)
+            for gram in trigrams(token):
+                self._discard(self._trigrams, gram, movie_id)
+
+        self._discard(self._genres, genre, movie_id)
+        if genre not in self._genres:
+            self._genre_labels.pop(genre, None)
+        self._remove_rating(self._ratings, rating, movie_id)
+        self._remove_rating(self._genre_ratings[genre], rating, movie_id)
+        if not self._genre_ratings[genre]:
+            del self._genre_ratings[genre]
+
+    def update_availability(self, movie):
+        """Keep the sold-out indexes in sync. Call whenever seats change. O(s)."""
+        if movie.movie_id in self._movies:
+            self._set_sold_out(movie.movie_id, not has_available_seats(movie))
+
+    def _set_sold_out(self, mid: int, sold_out: bool):
+        if sold_out == (mid in self._sold_out):
+            return
+        rating, genre = self._indexed[mid]
+        genre_list = self._sold_out_ratings.setdefault(genre, [])
+        if sold_out:
+            self._sold_out.add(mid)
+            insort(genre_list, (rating, mid))
+        else:
+            self._sold_out.discard(mid)
+            self._remove_rating(genre_list, rating, mid)
+            if not genre_list:
+                del self._sold_out_ratings[genre]
+
+    @staticmethod
+    def _discard(index: dict[str, set[int]], key: str, movie_id: int):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(movie_id)
+            if not ids:
+                del index[key]
+
+    @staticmethod
+    def _remove_rating(ratings: list[tuple[float, int]], rating: float, movie_id: int):
+        pos = bisect_left(ratings, (rating, movie_id))
+        if pos < len(ratings) and ratings[pos] == (rating, movie_id):
+            del ratings[pos]
+
+    # ── QUERYING ──────────────────────────
+    def _match_token(self, token: str) -> tuple[list[set[int]], bool] | None:
+        """
+        Posting sets a match must be in for one query word, and whether the
+        substring must be verified. None when nothing can match.
+        Sets are returned as-is (never copied).
+        """
+        if len(token) <= MAX_PREFIX_LEN:
+            ids = self._prefixes.get(token)
+            return ([ids], False) if ids else None
+
+        # 3+ characters → substring match via every trigram's posting set.
+        # A word starting with the token also contains it, so this covers
+        # prefix (typeahead) matches too. Trigrams may match out of order,
+        # so longer tokens are verified per candidate.
+        postings = [self._trigrams.get(g) for g in trigrams(token)]
+        if not all(postings):
+            return None
+        return postings, len(token) > 3
+
+    def search(self, query: str = "", genre: str | None = None,
+               min_rating: float | None = None, max_rating: float | None = None,
+               available: bool | None = None, limit: int = 20) -> dict:
+        """
+        Run a query with optional facets.
+        Returns { "total", "total_exact", "results": [Movie],
+                  "facets": {"genre": {...}} }
+        with results ordered by rating (highest first).
+        """
+        limit = max(limit, 0)
+        lo = float("-inf") if min_rating is None else min_rating
+        hi = float("inf") if max_rating is None else max_rating
+
+        # Constraints: a match is in every set and contains every substring
+        sets: list[set[int]] = []
+        substrings: list[str] = []
+        for token in set(tokenize(query)):
+            matched = self._match_token(token)
+            if matched is None:
+                return self._result([], 0, {}, True)
+            postings, verify = matched
+            sets.extend(postings)
+            if verify:
+                substrings.append(token)
+
+        genre_key = genre.lower() if genre else None
+        if genre_key is not None and genre_key not in self._genres:
+            return self._result([], 0, {}, True)
+
+        # Rating order to walk → the genre's own list when filtering by genre
+        ratings = self._genre_ratings[genre_key] if genre_key else self._ratings
+        start = bisect_left(ratings, (lo, float("-inf")))
+        stop = bisect_right(ratings, (hi, float("inf")))
+
+        if not sets and available is not False:
+            return self._search_facets(genre_key, lo, hi, ratings, start, stop,
+                                       available, limit)
+
+        if genre_key:
+            sets.append(self._genres[genre_key])
+        if available is False:
+            sets.append(self._sold_out)
+        sold_out = self._sold_out if available else None
+        rated = min_rating is not None or max_rating is not None
+        movies, texts = self._movies, self._text
+
+        # The smallest set drives; membership in the others is checked per id
+        sets.sort(key=len)
+        driver, others = sets[0], sets[1:]
+
+        def passes(mid: int) -> bool:
+            """Facet and substring checks for an id already in every set."""
+            if sold_out is not None and mid in sold_out:
+                return False
+            if rated and not lo <= movies[mid].rating <= hi:
+                return False
+            for sub in substrings:
+                if sub not in texts[mid]:
+                    return False
+            return True
+
+        def matches(mid: int) -> bool:
+            """Full check for an id already known to be in driver."""
+            for ids in others:
+                if mid not in ids:
+                    return False
+            return passes(mid)
+
+        # Small driver or rating range → filter it exactly
+        if len(driver) <= SCAN_LIMIT or stop - start <= SCAN_LIMIT:
+            if len(driver) <= stop - start:
+                hits = [mid for mid in driver if matches(mid)]
+            else:
+                hits = [mid for _, mid in ratings[start:stop]
+                        if mid in driver and matches(mid)]
+            return self._exact_result(hits, limit)
+
+        # Every set is large → walk the rating order from the top in blocks of
+        # SCAN_LIMIT until a page of results is found. A sample of the driver
+        # predicts how long that walk is and how much an exact pass (C
+        # intersection + ranking every match) costs; the cheaper one runs, and
+        # a walk that overruns the exact cost switches to the exact pass.
+        sample = list(islice(driver, SAMPLE_SIZE))
+        found = sum(1 for mid in sample if matches(mid))
+        estimate = found * len(driver) / len(sample)
+        budget = len(driver) * len(others) * INTERSECT_COST + estimate * RESULT_COST
+        expected = limit * (stop - start) / estimate if found else float("inf")
+
+        if expected <= budget:
+            hits = []
+            end = stop
+            while end > start and (end == stop or len(hits) < limit) and stop - end < budget:
+                block = max(start, end - SCAN_LIMIT)
+                hits.extend(mid for _, mid in reversed(ratings[block:end])
+                            if mid in driver and matches(mid))
+                end = block
+            if end == start:
+                return self._exact_result(hits, limit)
+            if len(hits) >= limit:
+                scale = (stop - start) / (stop - end)
+                return self._result(hits[:limit], round(len(hits) * scale),
+                                    self._genre_facets(hits, scale), False)
+
+        exact = driver
+        for ids in others:
+            exact = exact.intersection(ids)
+        return self._exact_result([mid for mid in exact if passes(mid)], limit)
+
+    def _search_facets(self, genre_key, lo, hi, ratings, start, stop,
+                       available, limit) -> dict:
+        """
+        No text query → exact counts from the per-genre rating lists.
+        O(G log n) plus a short walk for the top results.
+        """
+        keys = [genre_key] if genre_key else list(self._genre_ratings)
+        counts = {}
+        for key in keys:
+            genre_list = self._genre_ratings[key]
+            counts[key] = (bisect_right(genre_list, (hi, float("inf")))
+                           - bisect_left(genre_list, (lo, float("-inf"))))
+
+        if available:
+            # Subtract sold-out movies in range, counted the same way
+            for key in keys:
+                sold_list = self._sold_out_ratings.get(key, [])
+                counts[key] -= (bisect_right(sold_list, (hi, float("inf")))
+                                - bisect_left(sold_list, (lo, float("-inf"))))
+
+        top = []
+        for i in range(stop - 1, start - 1, -1):
+            if len(top) >= limit:
+                break
+            mid = ratings[i][1]
+            if not (available and mid in self._sold_out):
+                top.append(mid)
+
+        genre_counts = {self._genre_labels[key]: n for key, n in counts.items() if n}
+        return self._result(top, sum(counts.values()), genre_counts, True)
+
+    def _exact_result(self, hits: list[int], limit: int) -> dict:
+        movies = self._movies
+        top = heapq.nlargest(limit, hits, key=lambda mid: (movies[mid].rating, mid))
+        return self._result(top, len(hits), self._genre_facets(hits), True)
+
+    def _genre_facets(self, hits: list[int], scale: float = 1) -> dict:
+        """
+        Genre counts keyed like the no-text path: by genre key, shown with
+        its first-seen label, so "Action" and "action" are one facet.
+        """
+        indexed = self._indexed
+        counts = Counter(indexed[mid][1] for mid in hits)
+        return {self._genre_labels[key]: round(n * scale) for key, n in counts.items()}
+
+    def _result(self, top: list[int], total: int, genre_counts: dict, exact: bool) -> dict:
+        return {
+            "total": total,
+            "total_exact": exact,
+            "results": [self._movies[mid] for mid in top],
+            "facets": {"genre": genre_counts},
+        }
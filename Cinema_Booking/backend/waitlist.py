@@ -0,0 +1,142 @@
+"""
+Waitlist for sold-out shows.
+
+DSA Used:
+  - HashMap of Queues (deque) → (movie_id, slot) → FIFO of waiting requests
+  - HashMap                   → waitlist_id → WaitlistEntry, O(1) status lookup
+Freed seats always go to the head of the queue, which may be partially
+satisfied (e.g. 2 of 4 seats) and keeps its place for the rest.
+Leaving the waitlist only marks the entry; it is skipped lazily when it
+reaches the head, so promotion never scans the whole queue.
+"""
+import uuid
+from collections import deque
+from datetime import datetime
+
+
+# ─────────────────────────────────────────
+# CLASS: WaitlistEntry
+# ─────────────────────────────────────────
+class WaitlistEntry:
+    """One customer waiting for seats on a (movie, slot)."""
+
+    WAITING   = "WAITING"
+    PROMOTED  = "PROMOTED"
+    CANCELLED = "CANCELLED"
+
+    def __init__(self, customer_name: str, booking_type: str,
+                 movie_id: int, slot: str, seats: int):
+        self.waitlist_id   = "W" + str(uuid.uuid4())[:7].upper()
+        self.customer_name = customer_name
+        self.booking_type  = booking_type
+        self.movie_id      = movie_id
+        self.slot          = slot
+        self.seats         = seats
+        self.seats_promoted = 0
+        self.status        = WaitlistEntry.WAITING
+        self.ticket_ids: list[str] = []      # one ticket per promotion
+        self.joined_at     = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+    @property
+    def seats_remaining(self) -> int:
+        return self.seats - self.seats_promoted
+
+    def to_dict(self):
+        """Convert entry to dictionary for JSON serialization."""
+        return {
+            "waitlist_id": self.waitlist_id,
+            "customer_name": self.customer_name,
+            "booking_type": self.booking_type,
+            "movie_id": self.movie_id,
+            "slot": self.slot,
+            "seats": self.seats,
+            "seats_promoted": self.seats_promoted,
+            "status": self.status,
+            "ticket_ids": self.ticket_ids,
+            "joined_at": self.joined_at
+        }
+
+
+# ─────────────────────────────────────────
+# CLASS: Waitlist
+# ─────────────────────────────────────────
+class Waitlist:
+    """
+    Per-show FIFO queues of WaitlistEntry.
+    Promotion is O(k) in the number of entries removed from the head
+    (promoted or previously cancelled), never O(queue length).
+    """
+
+    def __init__(self):
+        # HashMap of Queues → (movie_id, slot) → deque[WaitlistEntry]
+        self._queues: dict[tuple[int, str], deque[WaitlistEntry]] = {}
+
+        # HashMap → waitlist_id → WaitlistEntry
+        self.entries: dict[str, WaitlistEntry] = {}
+
+    def join(self, customer_name: str, booking_type: str,
+             movie_id: int, slot: str, seats: int) -> WaitlistEntry:
+        """Append a request to the back of the queue. O(1)."""
+        entry = WaitlistEntry(customer_name, booking_type, movie_id, slot, seats)
+        self._queues.setdefault((movie_id, slot), deque()).append(entry)
+        self.entries[entry.waitlist_id] = entry
+        return entry
+
+    def get(self, waitlist_id: str) -> WaitlistEntry | None:
+        """O(1) HashMap lookup."""
+        return self.entries.get(waitlist_id)
+
+    def leave(self, waitlist_id: str) -> bool:
+        """
+        Stop waiting. O(1); the entry is removed lazily from the queue.
+        An entry that already holds tickets ends as PROMOTED with the seats
+        it got (the rest are given up); otherwise it becomes CANCELLED.
+        """
+        entry = self.entries.get(waitlist_id)
+        if not entry or entry.status != WaitlistEntry.WAITING:
+            return False
+        entry.status = WaitlistEntry.PROMOTED if entry.seats_promoted \
+            else WaitlistEntry.CANCELLED
+        return True
+
+    def _queue(self, movie_id: int, slot: str) -> deque[WaitlistEntry] | None:
+        """
+        Queue for a show with cancelled entries dropped from its head.
+        O(k) in entries dropped; empty queues are removed.
+        """
+        queue = self._queues.get((movie_id, slot))
+        while queue and queue[0].status != WaitlistEntry.WAITING:
+            queue.popleft()
+        if queue is not None and not queue:
+            del self._queues[(movie_id, slot)]
+            return None
+        return queue
+
+    def has_waiting(self, movie_id: int, slot: str) -> bool:
+        """True if anyone is waiting for this show. O(1) amortized."""
+        return self._queue(movie_id, slot) is not None
+
+    def allocate(self, movie_id: int, slot: str,
+                 available: int) -> list[tuple[WaitlistEntry, int]]:
+        """
+        Hand `available` seats to the queue in FIFO order.
+        Returns [(entry, seats granted), ...]. Fully served entries leave
+        the queue as PROMOTED; the last one may be partially served and
+        stays at the head. O(k) in entries served.
+        """
+        granted = []
+        queue = self._queue(movie_id, slot)
+        while queue and available > 0:
+            head = queue[0]
+            if head.status != WaitlistEntry.WAITING:
+                queue.popleft()              # lazily drop cancelled entries
+                continue
+            seats = min(head.seats_remaining, available)
+            available -= seats
+            head.seats_promoted += seats
+            granted.append((head, seats))
+            if head.seats_remaining == 0:
+                head.status = WaitlistEntry.PROMOTED
+                queue.popleft()
+        self._queue(movie_id, slot)          # tidy up an emptied queue
+        return granted
@@ -14,7 +14,8 @@ const state = {
   selectedSlot: null,
   selectedSeats: 1,
   isLoading: false,
-  pricePerSeat: 500, // Default price in INR
+  pricePerSeat: 500, // Base price in INR, shown until a showtime is picked
+  quoteRequest: 0, // Latest /quote request id, older responses are ignored
   currencySymbol: '₹', // Indian Rupees
 };
 
@@ -41,8 +42,9 @@ function setupEventListeners() {
     }
   });
 
-  // Update price when seat quantity changes
+  // Update price when seat quantity or booking type changes
   document.getElementById('seatInput').addEventListener('change', updatePriceSummary);
+  document.getElementById('typeInput').addEventListener('change', updatePriceSummary);
 
   // Search ticket on Enter key
   document.getElementById('search_id').addEventListener('keypress', (e) => {
@@ -99,8 +101,10 @@ function createMovieCard(movie) {
   
   const hasSlots = movie.slots && Object.keys(movie.slots).length > 0;
   
-  // Use poster_url from backend, fallback to placeholder
-  const posterUrl = movie.poster_url || `https://via.placeholder.com/300x450?text=${encodeURIComponent(movie.name)}`;
+  // Use poster_url from backend (local posters are relative to the API), fallback to placeholder
+  const posterUrl = movie.poster_url
+    ? (movie.poster_url.startsWith('/') ? `${API}${movie.poster_url}` : movie.poster_url)
+    : `https://via.placeholder.com/300x450?text=${encodeURIComponent(movie.name)}`;
   
   card.innerHTML = `
     <div class="movie-poster-container">
@@ -202,6 +206,9 @@ function selectSlot(slot, buttonElement) {
   });
   buttonElement.classList.add('selected');
 
+  // Price depends on the showtime's occupancy
+  updatePriceSummary();
+
   // Enable confirm button
   updateConfirmButtonState();
 }
@@ -217,20 +224,48 @@ function changeSeat(delta) {
   updateConfirmButtonState();
 }
 
+/**
+ * Update price summary.
+ * Before a showtime is picked, shows the base price (₹500, VIP 1.5x).
+ * After that, asks GET /quote for the demand-based price the backend
+ * will actually charge for this slot, type and seat count.
+ */
 function updatePriceSummary() {
   const seats = parseInt(document.getElementById('seatInput').value) || 1;
   const type = document.getElementById('typeInput').value;
   
   state.selectedSeats = seats;
-  
-  // VIP pricing: 1.5x the normal price
-  const multiplier = type === 'VIP' ? 1.5 : 1;
-  const pricePerSeat = state.pricePerSeat * multiplier;
-  const total = pricePerSeat * seats;
-
-  document.getElementById('pricePerSeat').textContent = `${state.currencySymbol}${pricePerSeat.toFixed(0)}`;
   document.getElementById('priceQuantity').textContent = seats;
-  document.getElementById('priceTotal').textContent = `${state.currencySymbol}${total.toFixed(0)}`;
+
+  if (!state.selectedMovie || !state.selectedSlot) {
+    const pricePerSeat = state.pricePerSeat * (type === 'VIP' ? 1.5 : 1);
+    renderPrice(pricePerSeat, pricePerSeat * seats);
+    return;
+  }
+
+  const requestId = ++state.quoteRequest;
+  const params = new URLSearchParams({
+    movie_id: state.selectedMovie.id,
+    slot: state.selectedSlot,
+    seats: seats,
+    type: type
+  });
+
+  fetch(`${API}/quote?${params}`)
+    .then(res => res.json())
+    .then(data => {
+      if (requestId !== state.quoteRequest) return; // a newer quote is on its way
+      if (data.error) throw new Error(data.error);
+      renderPrice(data.price_per_seat, data.total_price);
+    })
+    .catch(error => {
+      console.error('Error fetching quote:', error);
+    });
+}
+
+function renderPrice(pricePerSeat, total) {
+  document.getElementById('pricePerSeat').textContent = `${state.currencySymbol}${Math.round(pricePerSeat)}`;
+  document.getElementById('priceTotal').textContent = `${state.currencySymbol}${Math.round(total)}`;
 }
 
 function updateConfirmButtonState() {
@@ -283,15 +318,12 @@ function confirmBooking() {
       type: type
     })
   })
-    .then(res => {
-      if (!res.ok) throw new Error('Booking failed');
-      return res.json();
-    })
+    .then(res => res.json().then(data => {
+      // Show the backend's reason (e.g. others are on the waitlist)
+      if (!res.ok || data.error) throw new Error(data.error || 'Booking failed');
+      return data;
+    }))
     .then(data => {
-      if (data.error) {
-        throw new Error(data.error);
-      }
-
       // Save ticket ID to localStorage
       localStorage.setItem('lastTicket', data.ticket_id);
 
@@ -340,6 +372,10 @@ function showConfirmation(data, seats, type) {
       <strong>Type:</strong>
       <span>${type}</span>
     </p>
+    <p>
+      <strong>Total Paid:</strong>
+      <span>${state.currencySymbol}${data.total_price}</span>
+    </p>
   `;
 
   document.getElementById('confirmationPanel').classList.remove('hidden');
@@ -451,6 +487,10 @@ function renderBookingCard(cardElement, data, isLast) {
       <strong>Type:</strong>
       <span>${data.booking_type}</span>
     </p>
+    <p>
+      <strong>Total Paid:</strong>
+      <span>${state.currencySymbol}${data.total_price}</span>
+    </p>
     <button class="btn btn-danger btn-sm" onclick="cancelTicket('${data.ticket_id}')">
       Cancel Ticket
     </button>